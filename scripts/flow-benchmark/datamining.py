@@ -0,0 +1,162 @@
+# Copyright 2023 Greptime Team
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Scan `db_flow.log` produced by a flow benchmark run and find the first
+point where the rows counted by the flow's reduce output diverge from the
+rows its source has sent so far.
+
+The log is mmap'ed and scanned for the two literal prefixes directly, so
+no line is ever split off or decoded. When numba is installed the scan
+additionally runs as a JIT-compiled loop over the same buffer.
+"""
+
+import mmap
+import os
+
+try:
+    import numpy as np
+    from numba import njit
+
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Fixed literal prefixes in front of the row counts; everything else on the
+# line is irrelevant to the scan.
+SRC_LIT = b"Rendered Source All send: "
+OUT_LIT = b"Reduce Accum Subgraph send: [(Row { inner: [Int64("
+
+if HAS_NUMBA:
+    SRC_PREFIX = np.frombuffer(SRC_LIT, dtype=np.uint8)
+    OUT_PREFIX = np.frombuffer(OUT_LIT, dtype=np.uint8)
+
+    @njit(cache=True)
+    def _find(buf, pat, start):
+        last = buf.size - pat.size
+        for i in range(start, last + 1):
+            hit = True
+            for j in range(pat.size):
+                if buf[i + j] != pat[j]:
+                    hit = False
+                    break
+            if hit:
+                return i
+        return -1
+
+    @njit(cache=True)
+    def _parse_int(buf, p):
+        n = 0
+        while p < buf.size and 0x30 <= buf[p] and buf[p] <= 0x39:
+            n = n * 10 + (buf[p] - 0x30)
+            p += 1
+        return n, p
+
+    @njit(cache=True)
+    def _scan(buf, src_pat, out_pat):
+        """Walk src/out events in file order; return (src_send, out_send,
+        byte offset) of the first mismatch, or (src_send, -1, -1) if none."""
+        src_send = 0
+        sp = _find(buf, src_pat, 0)
+        op = _find(buf, out_pat, 0)
+        while sp != -1 or op != -1:
+            if op == -1 or (sp != -1 and sp < op):
+                n, q = _parse_int(buf, sp + src_pat.size)
+                src_send += n
+                sp = _find(buf, src_pat, q)
+            else:
+                out_send, q = _parse_int(buf, op + out_pat.size)
+                if out_send != src_send:
+                    return src_send, out_send, op
+                op = _find(buf, out_pat, q)
+        return src_send, -1, -1
+
+
+def scan_jit():
+    # mmap refuses empty files; an empty log trivially has no mismatch
+    if os.path.getsize("db_flow.log") == 0:
+        return 0, -1, -1
+    with open("db_flow.log", "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = np.frombuffer(mm, dtype=np.uint8)
+        src_send, out_send, pos = _scan(buf, SRC_PREFIX, OUT_PREFIX)
+        if out_send >= 0:
+            # Line numbers only matter on mismatch, so derive one lazily.
+            line_num = int(np.count_nonzero(buf[:pos] == 0x0A)) + 1
+            _report_early_exit(pos, buf.size)
+        else:
+            line_num = -1
+        del buf
+        mm.close()
+    return src_send, out_send, line_num
+
+
+def _report_early_exit(pos, size):
+    # show how much of the file the short-circuit skipped
+    print(f"stopped after {pos} of {size} bytes ({pos / size:.1%} of the log)")
+
+
+def _parse_int_at(mm, p):
+    n = 0
+    size = len(mm)
+    while p < size and 0x30 <= mm[p] <= 0x39:
+        n = n * 10 + (mm[p] - 0x30)
+        p += 1
+    return n, p
+
+
+def scan_mmap():
+    """Scan the mmap'ed log with bytes.find.
+
+    The searching runs in libc's memmem over the page cache; no per-line
+    string is ever allocated or utf-8 decoded.
+    """
+    # mmap refuses empty files; an empty log trivially has no mismatch
+    if os.path.getsize("db_flow.log") == 0:
+        return 0, -1, -1
+    with open("db_flow.log", "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            src_send = 0
+            sp = mm.find(SRC_LIT)
+            op = mm.find(OUT_LIT)
+            while sp != -1 or op != -1:
+                if op == -1 or (sp != -1 and sp < op):
+                    n, q = _parse_int_at(mm, sp + len(SRC_LIT))
+                    src_send += n
+                    sp = mm.find(SRC_LIT, q)
+                else:
+                    out_send, q = _parse_int_at(mm, op + len(OUT_LIT))
+                    if out_send != src_send:
+                        # only pay for line counting on the mismatch path
+                        _report_early_exit(op, len(mm))
+                        return src_send, out_send, mm[:op].count(b"\n") + 1
+                    op = mm.find(OUT_LIT, q)
+            return src_send, -1, -1
+        finally:
+            mm.close()
+
+
+def main():
+    src_send, out_send, line_num = scan_jit() if HAS_NUMBA else scan_mmap()
+    if out_send >= 0:
+        print(
+            f"mismatch at line {line_num}: "
+            f"source sent {src_send} rows but output counted {out_send}"
+        )
+    else:
+        print(f"no mismatch, source sent {src_send} rows in total")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+# Copyright 2023 Greptime Team
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark flow's overhead on a standalone instance.
+
+Starts `greptime standalone start`, optionally creates flows over a
+`numbers_input` table, then pushes rows at a fixed rate over the influxdb
+line-protocol endpoint while pidstat samples the server's CPU and RSS into
+`cpu_memory_usage_<mode>.log` (plotted later by plot_result.py). The server
+log for the flow run lands in `db_flow.log` for datamining.py to check.
+"""
+
+import asyncio
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter, Retry
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import psycopg
+except ImportError:
+    psycopg = None
+
+try:
+    # built from _lp_build.c via `python3 setup.py build_ext --inplace`
+    import _lp_build
+except ImportError:
+    _lp_build = None
+
+DB_HTTP_ADDR = "http://127.0.0.1:4000"
+INSERT_URL = DB_HTTP_ADDR + "/v1/influxdb/write?db=public"
+SQL_URL = DB_HTTP_ADDR + "/v1/sql?db=public"
+
+# One keep-alive session for every HTTP write; otherwise each 1000-row batch
+# pays a fresh TCP handshake, which dominates at small batch sizes. No shared
+# Content-Type: the SQL posts must stay form-encoded for axum's Form
+# extractor, so the line-protocol type is set per request in send_lp.
+SESSION = requests.Session()
+SESSION.mount(
+    DB_HTTP_ADDR,
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=3, backoff_factor=0.1),
+    ),
+)
+
+INSERT_DURATION = 60
+# rows per second pushed at the server
+INSERT_SPEED = 25_000
+# influxdb-style ingestion scales with batch size well into the 5k-25k range,
+# so send fewer, larger batches and keep a few of them in flight at once
+PER_REQUEST = 10_000
+WRITE_WORKERS = 4
+IN_FLIGHT = 8
+
+
+def send_lp(data):
+    response = SESSION.post(
+        INSERT_URL, data=data, headers={"Content-Type": "text/plain"}
+    )
+    response.raise_for_status()
+
+
+LINE_PREFIX = b"numbers_input, number="
+LINE_MID = b"i "
+
+
+def build_batch(batch_start, count, start_time):
+    # Digit formatting in C writes the whole batch into one pre-sized buffer
+    # with no per-row Python objects at all.
+    if _lp_build is not None:
+        return _lp_build.build_batch(batch_start, count, start_time)
+    # Append into one bytearray with constant bytes literals so only the two
+    # integers are formatted per row; returning bytes also saves requests/
+    # aiohttp an encode pass on the payload.
+    buf = bytearray()
+    for n, t in zip(
+        range(batch_start, batch_start + count),
+        range(start_time + batch_start, start_time + batch_start + count),
+    ):
+        buf += LINE_PREFIX
+        buf += str(n).encode()
+        buf += LINE_MID
+        buf += str(t).encode()
+        buf += b"\n"
+    return bytes(buf)
+
+
+async def _send_batches(batches):
+    # Bound in-flight requests so batch composition overlaps the network
+    # without flooding the server.
+    sem = asyncio.Semaphore(IN_FLIGHT)
+
+    async def send(session, data):
+        async with sem:
+            async with session.post(
+                INSERT_URL, data=data, headers={"Content-Type": "text/plain"}
+            ) as response:
+                response.raise_for_status()
+
+    async with aiohttp.ClientSession() as session:
+        await asyncio.gather(*(send(session, data) for data in batches))
+
+
+def do_insert(index, speed, start_time):
+    """Insert `speed` rows starting at `index`, in line-protocol batches."""
+    # clamp the last batch so a speed that isn't a multiple of PER_REQUEST
+    # doesn't overshoot the declared rate
+    batches = [
+        build_batch(
+            batch_start,
+            min(PER_REQUEST, index + speed - batch_start),
+            start_time,
+        )
+        for batch_start in range(index, index + speed, PER_REQUEST)
+    ]
+    if aiohttp is not None:
+        asyncio.run(_send_batches(batches))
+    else:
+        with ThreadPoolExecutor(max_workers=WRITE_WORKERS) as executor:
+            # list() drains the iterator so any raise_for_status error surfaces
+            list(executor.map(send_lp, batches))
+    return index + speed
+
+
+def do_sql_http(sql):
+    response = SESSION.post(SQL_URL, data={"sql": sql})
+    response.raise_for_status()
+    print(response.json())
+
+
+PSQL_CONN = None
+
+
+def do_sql_psql_client(sql):
+    """Run `sql` over one persistent postgres connection.
+
+    A fresh psql process per statement costs a fork, exec and handshake
+    each time; one authenticated connection pays that once. Falls back to
+    the HTTP endpoint when psycopg isn't installed.
+    """
+    global PSQL_CONN
+    if psycopg is None:
+        return do_sql_http(sql)
+    if PSQL_CONN is None:
+        PSQL_CONN = psycopg.connect(
+            host="127.0.0.1", port=4003, dbname="public", autocommit=True
+        )
+    with PSQL_CONN.cursor() as cur:
+        cur.execute(sql)
+        # queries have a result set; print it like psql did
+        if cur.description is not None:
+            for row in cur.fetchall():
+                print(row)
+        print(cur.statusmessage)
+
+
+do_sql = do_sql_psql_client
+
+
+def run_insert(duration, speed):
+    """Push `speed` rows per second for `duration` seconds."""
+    index = 0
+    start_time = time.time_ns() // 1_000_000
+    for _ in range(duration):
+        tick = time.time()
+        index = do_insert(index, speed, start_time)
+        elapsed = time.time() - tick
+        if elapsed < 1.0:
+            time.sleep(1.0 - elapsed)
+        else:
+            print(f"insert of {speed} rows fell behind by {elapsed - 1.0:.2f}s")
+    return index
+
+
+def with_flow_n(n):
+    """Run the insert workload with `n` identical flows over the input table."""
+    # One round trip for the whole setup script instead of a statement at a
+    # time: n+1 submissions -> 1.
+    setup = [
+        "CREATE TABLE IF NOT EXISTS numbers_input "
+        "(number INT, ts TIMESTAMP TIME INDEX)"
+    ]
+    setup.extend(
+        f"CREATE FLOW IF NOT EXISTS test_flow_{i} SINK TO out_num_cnt_{i} "
+        f"AS SELECT sum(number) FROM numbers_input"
+        for i in range(n)
+    )
+    do_sql(";\n".join(setup))
+    run_insert(INSERT_DURATION, INSERT_SPEED)
+    for i in range(n):
+        wait_sink(f"out_num_cnt_{i}")
+    for i in range(n):
+        do_sql(f"SELECT * FROM out_num_cnt_{i}")
+
+
+def wait_port(host, port, timeout=30):
+    """Block until `port` accepts connections, instead of a fixed sleep."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise TimeoutError(f"{host}:{port} not ready after {timeout}s")
+
+
+def wait_sink(table, timeout=10):
+    """Poll until the flow sink has materialized rows, instead of a fixed
+    post-insert sleep."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        response = SESSION.post(SQL_URL, data={"sql": f"SELECT count(*) FROM {table}"})
+        if response.ok:
+            try:
+                rows = response.json()["output"][0]["records"]["rows"]
+                if rows and rows[0][0] > 0:
+                    return
+            except (KeyError, IndexError, ValueError):
+                pass
+        time.sleep(0.2)
+    # don't mask a never-ready sink: the result SELECTs still run, but the
+    # reader should know they may be empty
+    print(f"warning: sink {table} still empty after {timeout}s")
+
+
+def run_database(binary, db_log, monitor_log):
+    db = subprocess.Popen(
+        [binary, "standalone", "start"],
+        stdout=subprocess.DEVNULL,
+        stderr=open(db_log, "w"),
+    )
+    wait_port("127.0.0.1", 4000)
+    wait_port("127.0.0.1", 4003)
+    monitor = subprocess.Popen(
+        ["pidstat", "-r", "-u", "-h", "-p", str(db.pid), "1"],
+        stdout=open(monitor_log, "w"),
+    )
+    return db, monitor
+
+
+def run_benchmark(mode, binary):
+    db, monitor = run_database(
+        binary, f"db_{mode}.log", f"cpu_memory_usage_{mode}.log"
+    )
+    try:
+        with_flow_n(1 if mode == "flow" else 0)
+    finally:
+        monitor.terminate()
+        db.terminate()
+        db.wait()
+
+
+def main():
+    binary = sys.argv[1] if len(sys.argv) > 1 else "greptime"
+    modes = sys.argv[2:] or ["baseline", "flow"]
+    for mode in modes:
+        run_benchmark(mode, binary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# Copyright 2023 Greptime Team
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Plot CPU and RSS of the baseline and flow benchmark runs from the
+pidstat logs written by flow_benchmark.py."""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib import pyplot as plt
+
+
+def parse_log(path):
+    """Parse `pidstat -h` output into a list of per-sample dicts.
+
+    Fallback for logs numpy can't load as a regular table (e.g. truncated
+    mid-line when the run was killed).
+    """
+    logs = []
+    columns = None
+    with open(path) as f:
+        for line in f:
+            if line.startswith("Linux") or not line.strip():
+                continue
+            if line.startswith("#"):
+                columns = line.lstrip("#").split()
+                continue
+            fields = line.split()
+            if columns is None or len(fields) != len(columns):
+                continue
+            logs.append(dict(zip(columns, fields)))
+    return logs
+
+
+def get_cpu_rss(logs):
+    # fromiter with count= pre-allocates the output, skipping the
+    # intermediate list and the list->array copy
+    cpu = np.fromiter((float(log["%CPU"]) for log in logs), np.float64, len(logs))
+    mem = np.fromiter((float(log["RSS"]) for log in logs), np.float64, len(logs))
+    return cpu, mem / 1000.0
+
+
+def parse_file(path):
+    """Return (%CPU, RSS in MB) series from a pidstat log.
+
+    The common case loads the whole table in one numpy call instead of a
+    Python-level loop over thousands of samples.
+    """
+    header = None
+    with open(path) as f:
+        for line in f:
+            if line.startswith("#"):
+                header = line.lstrip("#").split()
+                break
+    data = None
+    if header is not None:
+        try:
+            data = np.loadtxt(
+                path,
+                comments=("Linux", "#"),
+                usecols=(header.index("%CPU"), header.index("RSS")),
+                ndmin=2,
+            )
+        except ValueError:
+            data = None
+    if data is None:
+        return get_cpu_rss(parse_log(path))
+    return data[:, 0], data[:, 1] / 1000.0
+
+
+def main():
+    # the two logs are independent, so parse them in separate processes
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        base_fut = executor.submit(parse_file, "cpu_memory_usage_baseline.log")
+        flow_fut = executor.submit(parse_file, "cpu_memory_usage_flow.log")
+        baseline_cpu_mem = base_fut.result()
+        flow_cpu_mem = flow_fut.result()
+
+    # cap each line at ~1000 points so draw time and output size stay
+    # bounded for long runs
+    stride = max(
+        1, max(len(baseline_cpu_mem[0]), len(flow_cpu_mem[0])) // 1000
+    )
+
+    fig, (cpu_ax, mem_ax) = plt.subplots(2, 1, sharex=True, figsize=(10, 8))
+    cpu_ax.plot(baseline_cpu_mem[0][::stride], label="baseline")
+    cpu_ax.plot(flow_cpu_mem[0][::stride], label="with flow")
+    cpu_ax.set_ylabel("%CPU")
+    cpu_ax.legend()
+    mem_ax.plot(baseline_cpu_mem[1][::stride], label="baseline")
+    mem_ax.plot(flow_cpu_mem[1][::stride], label="with flow")
+    mem_ax.set_ylabel("RSS (MB)")
+    mem_ax.set_xlabel(f"sample (x{stride}s)")
+    mem_ax.legend()
+    # vector output: no Agg rasterization of the full line at every pixel
+    fig.savefig("cpu_memory_usage.pdf")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+# Copyright 2023 Greptime Team
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Builds the optional _lp_build extension used by flow_benchmark.py:
+
+    python3 setup.py build_ext --inplace
+"""
+
+from setuptools import Extension, setup
+
+setup(
+    name="lp_build",
+    ext_modules=[Extension("_lp_build", ["_lp_build.c"])],
+)